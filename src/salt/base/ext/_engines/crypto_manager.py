@@ -1,6 +1,5 @@
 import logging
 import os
-import psutil
 import time
 import salt.exceptions
 
@@ -42,7 +41,7 @@ def generate_key_handler(keyid=None, confirm=False, force=False, policy_name=Non
 @edmp.register_hook()
 def sign_string_handler(data, keyid=None):
     with conn:
-        log.info("Executing sign string on data: {}".format(data))
+        log.info("Executing sign string on data: %s", data)
 
         signature = conn.sign_string(data=data, keyid=keyid, expected_address=context.get("ethereum_address", None))
 
@@ -51,7 +50,7 @@ def sign_string_handler(data, keyid=None):
 @edmp.register_hook()
 def key_exists_handler(keyid=None):
     with conn:
-        log.info("Checking if key {} exists".format(str(keyid) if keyid else "default"))
+        log.info("Checking if key %s exists", str(keyid) if keyid else "default")
 
         key_exists = conn.key_exists(keyid)
 
@@ -71,11 +70,10 @@ def query_handler(cmd, *args, **kwargs):
     }
 
     if not cmd.startswith('_'):
-        cmd = "_{}".format(cmd)
+        cmd = "_" + cmd
 
-    try:
-        func = getattr(conn, cmd)
-    except AttributeError:
+    func = getattr(conn, cmd, None)
+    if func is None:
         ret["error"] = "Unsupported command: {:s}".format(cmd)
         return ret
 
@@ -93,10 +91,13 @@ def query_handler(cmd, *args, **kwargs):
 def start(**settings):
     try:
         if log.isEnabledFor(logging.DEBUG):
-            log.debug("Starting crypto manager with settings: {:}".format(settings))
+            log.debug("Starting crypto manager with settings: %s", settings)
 
-        # Give process higher priority
-        psutil.Process(os.getpid()).nice(-1)
+        # Give process higher priority (os.nice is relative so adjust from current niceness)
+        try:
+            os.nice(-1 - os.nice(0))
+        except OSError as err:
+            log.warning("Unable to give crypto manager process higher priority: %s", err)
 
         # Initialize connection
         global conn
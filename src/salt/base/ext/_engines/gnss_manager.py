@@ -3,7 +3,7 @@ import pynmea2
 import datetime
 
 from common_util import call_retrying
-from le910cx_conn import LE910CXConn
+from le910cx_conn import LE910CXConn, InvalidResponseException
 from messaging import EventDrivenMessageProcessor, extract_error_from
 from threading_more import intercept_exit_signal
 
@@ -34,7 +34,9 @@ def connection_handler(cmd, *args, **kwargs):
         ret["error"] = "Unsupported command: {:s}".format(cmd)
         return ret
 
-    res = call_retrying(func, args=args, kwargs=kwargs, limit=3, wait=0.2, context=context)
+    # NOTE: Invalid responses are already retried by the connection itself
+    res = call_retrying(func, args=args, kwargs=kwargs, limit=3, wait=0.2, context=context,
+        retry_on_exception=lambda ex: not isinstance(ex, InvalidResponseException))
     if res != None:
         if isinstance(res, dict):
             ret.update(res)
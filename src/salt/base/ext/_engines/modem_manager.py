@@ -35,7 +35,14 @@ def connection_handler(cmd, *args, **kwargs):
         ret["error"] = "Unsupported command: {:s}".format(cmd)
         return ret
 
-    res = func(*args, **kwargs)
+    try:
+        res = func(*args, **kwargs)
+    finally:
+
+        # A custom AT command may change modem state cached by the connection
+        if cmd == "execute":
+            conn.clear_cached_state()
+
     if res != None:
         if isinstance(res, dict):
             ret.update(res)
@@ -295,7 +295,7 @@ def min_max(it):
     return min_val, max_val
 
 
-def call_retrying(func, args=[], kwargs={}, limit=3, wait=0, context={}):
+def call_retrying(func, args=[], kwargs={}, limit=3, wait=0, context={}, retry_on_exception=None):
     count = 0
     while True:
         try:
@@ -306,7 +306,7 @@ def call_retrying(func, args=[], kwargs={}, limit=3, wait=0, context={}):
             context[msg] = context.setdefault(msg, 0) + 1
 
             count += 1
-            if count < limit:
+            if count < limit and (retry_on_exception == None or retry_on_exception(ex)):
                 time.sleep(wait)
 
                 continue
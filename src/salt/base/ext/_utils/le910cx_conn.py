@@ -1,6 +1,9 @@
+import array
 import datetime
+import fcntl
 import logging
 import re
+import termios
 import time
 import pynmea2
 import salt.exceptions
@@ -8,13 +11,48 @@ import salt.exceptions
 
 from serial_conn import SerialConn
 from retrying import retry
-from common_util import dict_key_by_value
 
 log = logging.getLogger(__name__)
 
+# Flag of the 'flags' field in the kernel's 'serial_struct' (see linux/serial.h)
+ASYNC_LOW_LATENCY = 0x2000
+
 # +CME ERROR: unknown
 error_regex = re.compile("ERROR|\+(?P<type>.+) ERROR: (?P<reason>.+)")
 
+# +CMEE: 2
+_CMEE_RE = re.compile("\+CMEE: (?P<mode>[0-2])")
+
+# +CMGF: 1
+_CMGF_RE = re.compile("\+CMGF: (?P<mode>[0-1])")
+
+# +CPMS: "<read_mem>",...
+_CPMS_RE = re.compile("\+CPMS: \"(?P<read_mem>[0-1])\"")
+
+# +GSN: 123456789012345
+_GSN_RE = re.compile("\+GSN: (?P<value>[0-9]+)")
+
+# +CMGL: 1,"REC READ","Vodafone","","23/03/16,08:13:50+00"
+_CMGL_META_RE = re.compile("^\+CMGL: (?P<index>[0-9]+)," + \
+    "\"(?P<status>[A-Z\s]+)\"," + \
+    "\"(?P<sender>\+?[a-zA-Z0-9]+)\"," + \
+    "\"(?P<alpha>[a-zA-Z0-9]*)\"," + \
+    "\"(?P<date>[0-9]{2}\/[0-9]{2}\/[0-9]{2})," + \
+    "(?P<time>[0-9]{2}:[0-9]{2}:[0-9]{2})" + \
+    "(?P<offset_sign>[+-])(?P<offset>[0-9]{2})\"" + \
+    ".*") # have to cover for some extra stuff that could occur here, i.e. [,<tooa/toda>,<length>]
+
+# $GPSACP: 093446.000,5702.1608N,00956.1064E,1.4,-30.6,3,0.0,0.0,0.0,140622,04,04
+_GPSACP_RE = re.compile(r"^\$GPSACP: (?P<utc>[0-9]{6}\.[0-9]{3})?,(?P<lat>[0-9]{4}\.[0-9]{4}[NS])?,(?P<lon>[0-9]{5}\.[0-9]{4}[WE])?,"
+    r"(?P<hdop>[0-9]+\.?[0-9]*)?,(?P<altitude>-?[0-9]+\.?[0-9]*)?,(?P<fix>[0-3]),(?P<cog>[0-9]+\.[0-9]+)?,(?P<spkm>[0-9]+\.[0-9]+)?,"
+    r"(?P<spkn>[0-9]+\.[0-9]+)?,(?P<date>[0-9]{6})?,(?P<nsat_gps>[0-9]{2})?,(?P<nsat_glonass>[0-9]{2})?")
+
+# $GPSP: 1
+_GPSP_RE = re.compile("\\$GPSP: (?P<status>[0-1])")
+
+# $GPSNMUN: 2,1,0,0,0,1,0
+_GPSNMUN_RE = re.compile(r"^\$GPSNMUN: (?P<mode>[0-3]),(?P<gga>[0-1]),(?P<gll>[0-1]),(?P<gsa>[0-1]),(?P<gsv>[0-1]),(?P<rmc>[0-1]),(?P<vtg>[0-1])")
+
 
 class LE910CXException(Exception):
     pass
@@ -61,6 +99,7 @@ SMS_FORMAT_MODES = {
     SMS_FORMAT_MODE_PUD:  "PUD",
     SMS_FORMAT_MODE_TEXT: "TXT"
 }
+SMS_FORMAT_MODES_INV = {v: k for k, v in SMS_FORMAT_MODES.items()}
 
 SMS_DELETE_ALL = 1
 
@@ -87,6 +126,7 @@ NMEA_MODE_MAP = {
     NMEA_MODE_SECOND_FMT: "second_format",
     NMEA_MODE_PORT_LOCK:  "port_lock",
 }
+NMEA_MODE_MAP_INV = {v: k for k, v in NMEA_MODE_MAP.items()}
 
 ME_ERROR_MODE_DISABLED = 0
 ME_ERROR_MODE_NUMERIC  = 1
@@ -97,6 +137,7 @@ ME_ERROR_MODE_MAP = {
     ME_ERROR_MODE_NUMERIC:  "numeric",
     ME_ERROR_MODE_VERBOSE:  "verbose",
 }
+ME_ERROR_MODE_MAP_INV = {v: k for k, v in ME_ERROR_MODE_MAP.items()}
 
 PERIODIC_RESET_MODE_DISABLED = 0
 PERIODIC_RESET_MODE_ONE_SHOT = 1
@@ -107,6 +148,7 @@ PERIODIC_RESET_MODE_MAP = {
     PERIODIC_RESET_MODE_ONE_SHOT: "one_shot",
     PERIODIC_RESET_MODE_PERIODIC: "periodic",
 }
+PERIODIC_RESET_MODE_MAP_INV = {v: k for k, v in PERIODIC_RESET_MODE_MAP.items()}
 
 FW_NET_CONF_ATT     = 0
 FW_NET_CONF_VERIZON = 1
@@ -121,6 +163,7 @@ FW_NET_CONF_MAP = {
     FW_NET_CONF_TELUS:   "telus",
     FW_NET_CONF_GLOBAL:  "global",
 }
+FW_NET_CONF_MAP_INV = {v: k for k, v in FW_NET_CONF_MAP.items()}
 
 FW_STORAGE_CONF_RAM = 0
 FW_STORAGE_CONF_NVM = 1
@@ -129,6 +172,7 @@ FW_STORAGE_CONF_MAP = {
     FW_STORAGE_CONF_RAM: "ram",
     FW_STORAGE_CONF_NVM: "nvm",
 }
+FW_STORAGE_CONF_MAP_INV = {v: k for k, v in FW_STORAGE_CONF_MAP.items()}
 
 QSS_STATUS_NOT_INSERTED              = 0
 QSS_STATUS_INSERTED                  = 1
@@ -153,6 +197,7 @@ CGDCONT_PDP_TYPE_MAP = {
     CGDCONT_PDP_TYPE_IPV6:   "ipv6",
     CGDCONT_PDP_TYPE_IPV4V6: "ipv4v6",
 }
+CGDCONT_PDP_TYPE_MAP_INV = {v: k for k, v in CGDCONT_PDP_TYPE_MAP.items()}
 
 SUPPORTED_DATATYPES = (bool, int, str)
 PARAM_TYPES = {'rdInline_wrInline': 1, 'inline_readonly': 2, 'rdInline_wrIndexed': 3}
@@ -171,12 +216,58 @@ class LE910CXConn(SerialConn):
     def __init__(self):
         super(LE910CXConn, self).__init__()
 
+        # Last known SMS format mode of the modem, used to avoid redundant queries
+        self._sms_format_mode = None
+
     def init(self, settings):
         super(LE910CXConn, self).init(settings)
 
     def open(self):
         super(LE910CXConn, self).open()
+
+        if self._settings.get("low_latency", True):
+            self._enable_low_latency()
+
         self.config(self._settings)
+
+    def _enable_low_latency(self):
+        """
+        Enables low latency mode on the serial port, so the driver passes received data on immediately instead of
+        waiting for its buffer timer to expire (16 ms by default for FTDI/USB serial drivers). The same as running
+        `setserial <device> low_latency`.
+        """
+
+        try:
+            fd = self._serial.fileno()
+
+            # Buffer is larger than 'serial_struct' - the 'flags' field is the fifth int (type, line, port, irq, flags)
+            buf = array.array("i", [0] * 32)
+            fcntl.ioctl(fd, termios.TIOCGSERIAL, buf)
+
+            if not buf[4] & ASYNC_LOW_LATENCY:
+                buf[4] |= ASYNC_LOW_LATENCY
+                fcntl.ioctl(fd, termios.TIOCSSERIAL, buf)
+
+                log.info("Enabled low latency mode on serial port")
+
+        except Exception as ex:
+
+            # Not all drivers support this (e.g. USB CDC-ACM) and neither do URL based connections
+            log.warning("Unable to enable low latency mode on serial port: %s", ex)
+
+    def close(self):
+        # Modem state may change while we are disconnected
+        self.clear_cached_state()
+
+        super(LE910CXConn, self).close()
+
+    def clear_cached_state(self):
+        """
+        Forget the modem state cached by this connection, so it is queried from the modem again when needed. Must be
+        called whenever the modem state may have been changed outside of this class, e.g. by a custom AT command.
+        """
+
+        self._sms_format_mode = None
         
     def config(self, settings):
         """
@@ -196,20 +287,23 @@ class LE910CXConn(SerialConn):
                     ready = True
                     break
                 except CommandExecutionException as e:
-                    log.exception("Received error {} while waiting for modem to be ready".format(e))
+                    log.exception("Received error %s while waiting for modem to be ready", e)
                     time.sleep(.5) # Sleep to give time for modem to be ready?
 
             if not ready:
                 raise Exception("Modem isn't ready to receive commands yet")
 
             # Configure echo on/off
-            self.execute("ATE{:d}".format(settings.get("echo_on", True)))
+            self.execute("ATE%d" % settings.get("echo_on", True))
 
             # Configure GNSS
-            if "error_config" in settings:
+            if "error_config" in settings and "gnss_session" in settings:
+                self._chained_error_config_and_gnss_session(settings["error_config"], settings["gnss_session"])
+
+            elif "error_config" in settings:
                 self.error_config(mode=settings["error_config"])
 
-            if "gnss_session" in settings:
+            elif "gnss_session" in settings:
                 self.gnss_session(status=settings["gnss_session"])
 
         except Exception as e:
@@ -242,7 +336,7 @@ class LE910CXConn(SerialConn):
                 res = self.read_until(ready_word, error_regex, timeout=timeout, echo_on=self._settings.get("echo_on", True))
 
                 if "error" in res:
-                    log.error("Command {} returned error {}".format(cmd, res["error"]))
+                    log.error("Command %s returned error %s", cmd, res["error"])
                     break
 
             log.debug("Got result: %s", res)
@@ -254,7 +348,7 @@ class LE910CXConn(SerialConn):
 
         # Wait if cooldown delay is defined
         if cooldown_delay != None:
-            log.info("Sleeps for {:f} seconds according to specified cooldown delay".format(cooldown_delay))
+            log.info("Sleeps for %f seconds according to specified cooldown delay", cooldown_delay)
             time.sleep(cooldown_delay)
 
         # Raise on error
@@ -263,6 +357,89 @@ class LE910CXConn(SerialConn):
 
         return res
 
+    @retry(retry_on_exception=lambda e: isinstance(e, InvalidResponseException), stop_max_attempt_number=3, wait_exponential_multiplier=50)
+    def _execute_and_match(self, cmd, regex):
+        """
+        Execute an AT command and match the response data against the given regex. Invalid responses are retried,
+        as these are mostly caused by transient events like unsolicited result codes interleaved with the response.
+
+        Returns the regex match object.
+        """
+
+        res = self.execute(cmd)
+
+        # Unsolicited result codes can result in multiple lines, so look for the first matching one
+        data = res.get("data") or ""
+        match = None
+        for line in (data if type(data) == list else [data]):
+            match = regex.match(line)
+            if match:
+                break
+
+        if not match:
+            log.error("Didn't receive expected response to command %s from modem: %s", cmd, res)
+            raise InvalidResponseException("Didn't receive expected response")
+
+        return match
+
+    def execute_chained(self, cmds, **kwargs):
+        """
+        Execute multiple AT commands in a single command line. The commands are joined with ';' and the modem
+        only responds with a single final result code for all of them.
+
+        Arguments:
+        - cmds (list of strings): The commands to be executed, without the 'AT' prefix. E.g. `["+CMEE?", "$GPSP?"]`.
+
+        Optional arguments are the same as for the `execute` function.
+        """
+
+        return self.execute("AT" + ";".join(cmds), **kwargs)
+
+    def _chained_error_config_and_gnss_session(self, mode, status):
+        """
+        Query and, if needed, apply both the error config and GNSS session settings using chained AT commands.
+        Falls back to configuring the settings one by one if the modem does not respond as expected.
+        """
+
+        # Validate settings
+        if type(mode) != str or mode not in ME_ERROR_MODE_MAP_INV:
+            raise ValueError("'mode' argument needs to be one of {}".format(sorted(ME_ERROR_MODE_MAP_INV)))
+
+        if type(status) != bool:
+            raise TypeError("'status' parameter needs to be of type 'bool'")
+
+        try:
+            res = self.execute_chained(["+CMEE?", "$GPSP?"])
+
+            # Expected response data: ["+CMEE: <mode>", "$GPSP: <status>"]
+            data = res.get("data", None)
+            if type(data) != list or len(data) != 2:
+                log.error("Didn't receive expected response from modem: %s", res)
+                raise InvalidResponseException("Didn't receive expected response")
+
+            cmee_match = _CMEE_RE.match(data[0])
+            gpsp_match = _GPSP_RE.match(data[1])
+            if not cmee_match or not gpsp_match:
+                log.error("Didn't receive expected response from modem: %s", res)
+                raise InvalidResponseException("Didn't receive expected response")
+
+            cmds = []
+            if ME_ERROR_MODE_MAP[int(cmee_match.group("mode"))] != mode:
+                cmds.append("+CMEE=%d" % ME_ERROR_MODE_MAP_INV[mode])
+
+            # NOTE: Have to parse to int first, as any non-empty string will result in a truthy value
+            if bool(int(gpsp_match.group("status"))) != status:
+                cmds.append("$GPSP=%d" % status)
+
+            if cmds:
+                self.execute_chained(cmds)
+
+        except (InvalidResponseException, CommandExecutionException):
+            log.warning("Failed to configure modem using chained AT commands, falling back to separate commands", exc_info=True)
+
+            self.error_config(mode=mode)
+            self.gnss_session(status=status)
+
     def error_config(self, mode=None, force=False):
         """
         Configures the error values the modem returns.
@@ -279,25 +456,18 @@ class LE910CXConn(SerialConn):
         """
 
         ret = {}
-        res = self.execute("AT+CMEE?")
-
-        res_regex = re.compile("\+CMEE: (?P<mode>[0-2])")
-        match = res_regex.match(res.get("data", ""))
-
-        if not match:
-            log.error("Didn't receive expected response from modem: {}".format(res))
-            raise InvalidResponseException("Didn't receive expected response")
+        match = self._execute_and_match("AT+CMEE?", _CMEE_RE)
 
         ret["mode"] = ME_ERROR_MODE_MAP[int(match.group("mode"))]
 
         if mode != None:
             # Validate mode
-            if type(mode) != str or mode not in ME_ERROR_MODE_MAP.values():
-                raise ValueError("'mode' argument needs to be one of {}".format(ME_ERROR_MODE_MAP.values()))
+            if type(mode) != str or mode not in ME_ERROR_MODE_MAP_INV:
+                raise ValueError("'mode' argument needs to be one of {}".format(sorted(ME_ERROR_MODE_MAP_INV)))
 
             if ret["mode"] != mode or force:
-                mode_val = dict_key_by_value(ME_ERROR_MODE_MAP, mode)
-                self.execute("AT+CMEE={:d}".format(mode_val))
+                mode_val = ME_ERROR_MODE_MAP_INV[mode]
+                self.execute("AT+CMEE=%d" % mode_val)
 
                 ret["mode"] = mode
 
@@ -305,7 +475,13 @@ class LE910CXConn(SerialConn):
 
     def imei(self):
         res = self.execute("AT+GSN=1")
-        return re.compile("\\+GSN: (?P<value>[0-9]+)").match(res.get("data", "")).groupdict()
+
+        match = _GSN_RE.match(res.get("data") or "")
+        if not match:
+            log.error("Didn't receive expected response from modem: %s", res)
+            raise InvalidResponseException("Didn't receive expected response")
+
+        return match.groupdict()
 
     def manufacturer_id(self):
         ret = {}
@@ -328,6 +504,9 @@ class LE910CXConn(SerialConn):
 
         self.execute("ATZ")
 
+        # Settings are restored from the user profile
+        self.clear_cached_state()
+
         return ret
 
     def reset(self, mode=None, delay=0):
@@ -353,7 +532,7 @@ class LE910CXConn(SerialConn):
 
             match = res_regex.match(res.get("data", ""))
             if not match:
-                log.error("Didn't receive expected response: {}".format(res))
+                log.error("Didn't receive expected response: %s", res)
                 raise InvalidResponseException("Didn't receive expected response")
 
             ret["mode"] = match.group("mode")
@@ -368,19 +547,22 @@ class LE910CXConn(SerialConn):
 
         # Otherwise, lets set it
         # Validate first
-        if type(mode) != str or mode not in PERIODIC_RESET_MODE_MAP.values():
-            raise ValueError("'mode' parameter must be one of {}".format(PERIODIC_RESET_MODE_MAP.values()))
+        if type(mode) != str or mode not in PERIODIC_RESET_MODE_MAP_INV:
+            raise ValueError("'mode' parameter must be one of {}".format(sorted(PERIODIC_RESET_MODE_MAP_INV)))
 
         if type(delay) != int:
             raise TypeError("'delay' parameter must be an integer")
 
         # Construct AT command
-        mode_val = dict_key_by_value(PERIODIC_RESET_MODE_MAP, mode)
-        cmd = "AT#ENHRST={:d}".format(mode_val)
+        mode_val = PERIODIC_RESET_MODE_MAP_INV[mode]
+        cmd = "AT#ENHRST=%d" % mode_val
 
         # Do we need to add the delay?
         if mode_val in [PERIODIC_RESET_MODE_ONE_SHOT, PERIODIC_RESET_MODE_PERIODIC]:
-            cmd += ",{:d}".format(delay)
+            cmd += ",%d" % delay
+
+        # The modem will reboot, so settings known so far can no longer be relied on
+        self.clear_cached_state()
 
         # Don't keep connection if we're immediately resetting, wait for modem to come back up
         if mode_val in [PERIODIC_RESET_MODE_ONE_SHOT, PERIODIC_RESET_MODE_PERIODIC] and delay == 0:
@@ -404,10 +586,10 @@ class LE910CXConn(SerialConn):
         ret = {}
 
         res = self.execute("AT+CPMS?")
-        re.compile("\\+CPMS: \"(?P<read_mem>[0-1])\"").match(res.get("data", ""))
+        _CPMS_RE.match(res.get("data", ""))
 
 
-        ret["mode"] = SMS_FORMAT_MODES.get(int(re.compile("\\+CMGF: (?P<mode>[0-1])").match(res.get("data", "")).group("mode")), None)
+        ret["mode"] = SMS_FORMAT_MODES.get(int(_CMGF_RE.match(res.get("data", "")).group("mode")), None)
 
     def sms_format(self, mode=None, force=False):
         """
@@ -421,21 +603,35 @@ class LE910CXConn(SerialConn):
 
         ret = {}
 
-        if not force:
-            res = self.execute("AT+CMGF?")
-            ret["mode"] = SMS_FORMAT_MODES.get(int(re.compile("\\+CMGF: (?P<mode>[0-1])").match(res.get("data", "")).group("mode")), None)
-        elif mode == None:
-            raise ValueError("Mode must be specified")
-
         if mode != None:
             mode = mode.upper()
 
-            if not mode in SMS_FORMAT_MODES.values():
+            if not mode in SMS_FORMAT_MODES_INV:
                 raise ValueError("Unsupported mode")
 
+        if not force:
+
+            # When setting, there is no need to query the modem if the current mode is already known
+            if mode != None and self._sms_format_mode != None:
+                ret["mode"] = self._sms_format_mode
+            else:
+                res = self.execute("AT+CMGF?")
+
+                match = _CMGF_RE.match(res.get("data") or "")
+                if not match:
+                    log.error("Didn't receive expected response from modem: %s", res)
+                    raise InvalidResponseException("Didn't receive expected response")
+
+                ret["mode"] = SMS_FORMAT_MODES.get(int(match.group("mode")), None)
+                self._sms_format_mode = ret["mode"]
+        elif mode == None:
+            raise ValueError("Mode must be specified")
+
+        if mode != None:
             if force or mode != ret["mode"]:
-                self.execute("AT+CMGF={:d}".format(dict_key_by_value(SMS_FORMAT_MODES, mode)))
+                self.execute("AT+CMGF=%d" % SMS_FORMAT_MODES_INV[mode])
                 ret["mode"] = mode
+                self._sms_format_mode = mode
 
         return ret
 
@@ -463,13 +659,13 @@ class LE910CXConn(SerialConn):
 
         ret = {"values": []}
 
-        # Ensure message format mode
-        prev_format_mode = self.sms_format().get("mode", "PUD")
+        # Ensure message format mode (only query the modem if the current mode is unknown)
+        prev_format_mode = self._sms_format_mode or self.sms_format().get("mode", "PUD")
         if prev_format_mode != format_mode:
             self.sms_format(mode=format_mode)
 
         try:
-            res = self.execute("AT+CMGL=\"{:s}\"".format(status))
+            res = self.execute("AT+CMGL=\"%s\"" % status)
             if not res.get("data", None):
                 return ret
 
@@ -479,32 +675,19 @@ class LE910CXConn(SerialConn):
 
             # Examples:
             # +CMGL: 1,"REC READ","Vodafone","","23/03/16,08:13:50+00"
-            meta_regex = re.compile("^\+CMGL: (?P<index>[0-9]+)," + \
-                    "\"(?P<status>[A-Z\s]+)\"," + \
-                    "\"(?P<sender>\+?[a-zA-Z0-9]+)\"," + \
-                    "\"(?P<alpha>[a-zA-Z0-9]*)\"," + \
-                    "\"(?P<scts>.+)\"" + \
-                    ".*") # have to cover for some extra stuff that could occur here, look at structure above
-
-            scts_regex = re.compile("^(?P<date>[0-9]{2}\/[0-9]{2}\/[0-9]{2})," + \
-                    "(?P<time>[0-9]{2}:[0-9]{2}:[0-9]{2})(?P<offset_sign>[+-])(?P<offset>[0-9]{2})")
-
-            # NOTE NV: This could potentially cause problems if the output is unexpected, we don't check it before
-            # actually starting the loop...
-            for i in range(0, len(res["data"]), 2): # Process every second one - one message is two entries in here
-                meta = res["data"][i]
-                data = res["data"][i+1]
-
-                # Parse meta
-                meta_match = meta_regex.match(meta)
-                if not meta_match:
-                    log.error("Didn't receive expected response from modem: {}".format(meta))
-                    raise InvalidResponseException("Didn't receive expected response")
 
-                # Parse timestamp (https://stackoverflow.com/a/35444511)
-                scts_match = scts_regex.match(meta_match.group("scts"))
-                if not scts_match:
-                    log.error("Didn't receive expected Service Center Time Stamp from modem: {}. Full meta line: {}".format(scts, meta))
+            # A single line response is returned as a string
+            lines = res["data"] if type(res["data"]) == list else [res["data"]]
+
+            # One message is two entries in here - iterate them in (meta, data) pairs
+            # NOTE: A trailing meta line without data is dropped
+            it = iter(lines)
+            for meta, data in zip(it, it):
+
+                # Parse meta including the Service Center Time Stamp (https://stackoverflow.com/a/35444511)
+                meta_match = _CMGL_META_RE.match(meta)
+                if not meta_match:
+                    log.error("Didn't receive expected response from modem: %s", meta)
                     raise InvalidResponseException("Didn't receive expected response")
 
                 # NOTE NV: Since the modem stores a time offset value (timezone info) we need to use that
@@ -513,20 +696,17 @@ class LE910CXConn(SerialConn):
 
                 # example timestamp from modem:    21/11/16,14:10:00+04 (each offset increment equals 15 minutes)
                 # utc timestamp after calculation: 2021-11-16T13:10:00
-                offset_sign = scts_match.group("offset_sign")
-                offset = int(scts_match.group("offset"))
-                offset_duration = datetime.timedelta(minutes=(15 * offset))
+                offset_duration = datetime.timedelta(minutes=(15 * int(meta_match.group("offset"))))
 
-                msg_timestamp = datetime.datetime.strptime("{}T{}".format(scts_match.group("date"), scts_match.group("time")), "%y/%m/%dT%H:%M:%S")
+                msg_timestamp = datetime.datetime.strptime("{}T{}".format(meta_match.group("date"), meta_match.group("time")), "%y/%m/%dT%H:%M:%S")
 
                 # NOTE: When offset is positive, we need to go back in time to get to UTC
                 # NOTE: When offset is negative, we need to go forward in time to get to UTC
-                if offset_sign == "+":
+                # NOTE: The offset sign is guaranteed to be either '+' or '-' by the meta regex
+                if meta_match.group("offset_sign") == "+":
                     msg_timestamp = msg_timestamp - offset_duration
-                elif offset_sign == "-":
-                    msg_timestamp = msg_timestamp + offset_duration
                 else:
-                    raise Exception("Received an unexpected time offset sign: {}".format(offset_sign))
+                    msg_timestamp = msg_timestamp + offset_duration
 
                 msg = {
                     "index": int(meta_match.group("index")), # Casting this, other functions relying on this parameter expect it to be an integer
@@ -545,10 +725,11 @@ class LE910CXConn(SerialConn):
                 ret["clear"] = res
 
         finally:
-            try:
-                self.sms_format(mode=prev_format_mode)
-            except:
-                log.exception("Failed to restore SMS format mode")
+            if prev_format_mode != format_mode:
+                try:
+                    self.sms_format(mode=prev_format_mode)
+                except:
+                    log.exception("Failed to restore SMS format mode")
 
         return ret
 
@@ -589,11 +770,11 @@ class LE910CXConn(SerialConn):
                 # Skip non int indexes
                 if type(i) is not int:
                     ret["deleted"][i] = False
-                    log.warning("Skipping provided index {} as it's not a number".format(i))
+                    log.warning("Skipping provided index %s as it's not a number", i)
                     continue
 
-                log.info("Deleting message with index {}".format(i))
-                self.execute("AT+CMGD={},0".format(i))
+                log.info("Deleting message with index %s", i)
+                self.execute("AT+CMGD=%d,0" % i)
                 ret["deleted"][i] = True
 
         return ret
@@ -608,49 +789,34 @@ class LE910CXConn(SerialConn):
         """
 
         ret = {}
-        res = self.execute("AT$GPSACP")
 
         # Example responses (you can use these for testing)
         # $GPSACP: 093446.000,5702.1608N,00956.1064E,1.4,-30.6,3,0.0,0.0,0.0,140622,04,04
         # $GPSACP: 123748.004,5702.1860N,00956.1058E,2.2,21.1,3,0.0,0.0,0.0,130622,06,00
         # $GPSACP: ,,,,,1,,,,,,           NOTE: Nofix
-        res_regex = re.compile("^\$GPSACP: " + \
-            "(?P<utc>[0-9]{6}\.[0-9]{3})?," + \
-            "(?P<lat>[0-9]{4}\.[0-9]{4}(N|S))?," + \
-            "(?P<lon>[0-9]{5}\.[0-9]{4}(W|E))?," + \
-            "(?P<hdop>[0-9]+\.?[0-9]*)?," + \
-            "(?P<altitude>-?[0-9]+\.?[0-9]*)?," + \
-            "(?P<fix>[0-3])," + \
-            "(?P<cog>[0-9]+\.[0-9]+)?," + \
-            "(?P<spkm>[0-9]+\.[0-9]+)?," + \
-            "(?P<spkn>[0-9]+\.[0-9]+)?," + \
-            "(?P<date>[0-9]{6})?," + \
-            "(?P<nsat_gps>[0-9]{2})?," + \
-            "(?P<nsat_glonass>[0-9]{2})?")
+        match = self._execute_and_match("AT$GPSACP", _GPSACP_RE)
 
-        match = res_regex.match(res.get("data", ""))
+        # Fetch all groups at once instead of looking up each group by name
+        groups = match.groupdict()
 
-        if not match:
-            log.error("Didn't receive expected response from modem: {}".format(res))
-            raise InvalidResponseException("Didn't receive expected response")
-
-        if int(match.group("fix")) in [ GNSS_LOCATION_FIX_INVALID_FIX, GNSS_LOCATION_FIX_NO_FIX ]:
+        fix = int(groups["fix"])
+        if fix in [ GNSS_LOCATION_FIX_INVALID_FIX, GNSS_LOCATION_FIX_NO_FIX ]:
             raise NoFixWarning()
 
         # Parse response
-        time_utc = match.group("utc")
-        date_utc = match.group("date")
+        time_utc = groups["utc"]
+        date_utc = groups["date"]
         ret = {
             "time_utc":     "{}:{}:{}".format(time_utc[0:2], time_utc[2:4], time_utc[4:6]),
             "date_utc":     "20{}-{}-{}".format(date_utc[4:6], date_utc[2:4], date_utc[0:2]), # NOTE: Date can only start from year 2000
-            "hdop":         float(match.group("hdop")),
-            "alt":          float(match.group("altitude")),
-            "fix":          GNSS_LOCATION_FIX_MAP[int(match.group("fix"))],
-            "cog":          float(match.group("cog")),
-            "sog_km":       float(match.group("spkm")),
-            "sog_kn":       float(match.group("spkn")),
-            "nsat_gps":     int(match.group("nsat_gps")),
-            "nsat_glonass": int(match.group("nsat_glonass")),
+            "hdop":         float(groups["hdop"]),
+            "alt":          float(groups["altitude"]),
+            "fix":          GNSS_LOCATION_FIX_MAP[fix],
+            "cog":          float(groups["cog"]),
+            "sog_km":       float(groups["spkm"]),
+            "sog_kn":       float(groups["spkn"]),
+            "nsat_gps":     int(groups["nsat_gps"]),
+            "nsat_glonass": int(groups["nsat_glonass"]),
         }
 
         """
@@ -665,7 +831,7 @@ class LE910CXConn(SerialConn):
         """
         if decimal_degrees:
             # Calculate latitude
-            lat = match.group("lat")
+            lat = groups["lat"]
             lat_deg = float(lat[:2])
             lat_min = float(lat[2:-1])
             lat_direction = lat[-1]
@@ -675,7 +841,7 @@ class LE910CXConn(SerialConn):
                 lat_dd = lat_dd * -1
 
             # Calculate longitude
-            lon = match.group("lon")
+            lon = groups["lon"]
             lon_deg = float(lon[:3])
             lon_min = float(lon[3:-1])
             lon_direction = lon[-1]
@@ -689,8 +855,8 @@ class LE910CXConn(SerialConn):
             ret["lon"] = lon_dd
 
         else:
-            ret["lat"] = match.group("lat")
-            ret["lon"] = match.group("lon")
+            ret["lat"] = groups["lat"]
+            ret["lon"] = groups["lon"]
 
         return ret
 
@@ -704,14 +870,7 @@ class LE910CXConn(SerialConn):
         """
 
         ret = {}
-        res = self.execute("AT$GPSP?")
-
-        res_regex = re.compile("\\$GPSP: (?P<status>[0-1])")
-        match = res_regex.match(res.get("data", ""))
-
-        if not match:
-            log.error("Didn't receive expected response from modem: {}".format(res))
-            raise InvalidResponseException("Didn't receive expected response")
+        match = self._execute_and_match("AT$GPSP?", _GPSP_RE)
 
         # NOTE: Have to parse to int first, as any non-empty string will result in a truthy value
         ret["status"] = bool(int(match.group("status")))
@@ -721,7 +880,7 @@ class LE910CXConn(SerialConn):
                 raise TypeError("'status' parameter needs to be of type 'bool'")
 
             if status != ret["status"] or force:
-                self.execute("AT$GPSP={:d}".format(status))
+                self.execute("AT$GPSP=%d" % status)
                 ret["status"] = status
 
         return ret
@@ -749,22 +908,7 @@ class LE910CXConn(SerialConn):
         """
 
         ret = {}
-        res = self.execute("AT$GPSNMUN?")
-
-        res_regex = re.compile("^\$GPSNMUN: " + \
-                "(?P<mode>[0-3])," + \
-                "(?P<gga>[0-1])," + \
-                "(?P<gll>[0-1])," + \
-                "(?P<gsa>[0-1])," + \
-                "(?P<gsv>[0-1])," + \
-                "(?P<rmc>[0-1])," + \
-                "(?P<vtg>[0-1])"
-        )
-        match = res_regex.match(res.get("data", ""))
-
-        if not match:
-            log.error("Didn't receive expected response from modem: {}".format(res))
-            raise InvalidResponseException("Didn't receive expected response")
+        match = self._execute_and_match("AT$GPSNMUN?", _GPSNMUN_RE)
 
         # Construct return value
         # NOTE: We need to parse to int first, as any non-empty string will result in a truthy value: bool('0') == True
@@ -778,8 +922,8 @@ class LE910CXConn(SerialConn):
 
         if mode != None:
             # Validate mode
-            if type(mode) != str or mode not in NMEA_MODE_MAP.values():
-                raise ValueError("'mode' argument needs to be one of {}".format(NMEA_MODE_MAP.values()))
+            if type(mode) != str or mode not in NMEA_MODE_MAP_INV:
+                raise ValueError("'mode' argument needs to be one of {}".format(sorted(NMEA_MODE_MAP_INV)))
 
             # Validate services
             if type(gga) != bool or \
@@ -791,17 +935,11 @@ class LE910CXConn(SerialConn):
                 raise ValueError("'gga', 'gll', 'gsa', 'gsv', 'rmc' and 'vtg' parameters all need to be of type 'bool'")
 
             # Determine if we need to execute an extra command
-            if ret["mode"] != mode or \
-            ret["gga"] != gga or \
-            ret["gll"] != gll or \
-            ret["gsa"] != gsa or \
-            ret["gsv"] != gsv or \
-            ret["rmc"] != rmc or \
-            ret["vtg"] != vtg or \
-            force:
-                mode_val = dict_key_by_value(NMEA_MODE_MAP, mode)
-                cmd = "AT$GPSNMUN={:d},{:d},{:d},{:d},{:d},{:d},{:d}".format(
-                    dict_key_by_value(NMEA_MODE_MAP, mode), bool(gga), bool(gll), bool(gsa), bool(gsv), bool(rmc), bool(vtg))
+            current = (ret["mode"], ret["gga"], ret["gll"], ret["gsa"], ret["gsv"], ret["rmc"], ret["vtg"])
+            desired = (mode, gga, gll, gsa, gsv, rmc, vtg)
+            if force or current != desired:
+                mode_val = NMEA_MODE_MAP_INV[mode]
+                cmd = "AT$GPSNMUN=%d,%d,%d,%d,%d,%d,%d" % (mode_val, gga, gll, gsa, gsv, rmc, vtg)
 
                 if mode_val == NMEA_MODE_PORT_LOCK:
                     res = self.execute(cmd, ready_words=["CONNECT"])
@@ -810,12 +948,12 @@ class LE910CXConn(SerialConn):
 
                 # Construct return value
                 ret["mode"] = mode
-                ret["gga"] = bool(gga)
-                ret["gll"] = bool(gll)
-                ret["gsa"] = bool(gsa)
-                ret["gsv"] = bool(gsv)
-                ret["rmc"] = bool(rmc)
-                ret["vtg"] = bool(vtg)
+                ret["gga"] = gga
+                ret["gll"] = gll
+                ret["gsa"] = gsa
+                ret["gsv"] = gsv
+                ret["rmc"] = rmc
+                ret["vtg"] = vtg
 
         return ret
 
@@ -894,7 +1032,7 @@ class LE910CXConn(SerialConn):
         match = res_regex.match(res.get("data", ""))
 
         if not match:
-            log.error("Didn't receive expected response from modem: {}".format(res))
+            log.error("Didn't receive expected response from modem: %s", res)
             raise InvalidResponseException("Didn't receive expected response")
 
         ret["net_conf"] = FW_NET_CONF_MAP[int(match.group("net_conf"))]
@@ -904,27 +1042,27 @@ class LE910CXConn(SerialConn):
             raise ValueError("You must set 'net_conf' value if you're also setting 'storage_conf' value")
 
         if net_conf != None:
-            if type(net_conf) != str or net_conf not in FW_NET_CONF_MAP.values():
-                raise ValueError("'net_conf' needs to be one of {}".format(FW_NET_CONF_MAP.values()))
+            if type(net_conf) != str or net_conf not in FW_NET_CONF_MAP_INV:
+                raise ValueError("'net_conf' needs to be one of {}".format(sorted(FW_NET_CONF_MAP_INV)))
 
             if ret["net_conf"] != net_conf or force:
-                net_conf_val = dict_key_by_value(FW_NET_CONF_MAP, net_conf)
-                cmd = "AT#FWSWITCH={:d}".format(net_conf_val)
+                net_conf_val = FW_NET_CONF_MAP_INV[net_conf]
+                cmd = "AT#FWSWITCH=%d" % net_conf_val
                 ret["net_conf"] = net_conf
 
                 # Also decide storage method, although as per AT command spec, this is just a dummy parameter
                 if storage_conf != None:
                     # Use passed value
-                    if type(storage_conf) != str or storage_conf not in FW_STORAGE_CONF_MAP.values():
-                        raise ValueError("'storage_conf' needs to be one of {}".format(FW_STORAGE_CONF_MAP.values()))
+                    if type(storage_conf) != str or storage_conf not in FW_STORAGE_CONF_MAP_INV:
+                        raise ValueError("'storage_conf' needs to be one of {}".format(sorted(FW_STORAGE_CONF_MAP_INV)))
 
-                    storage_conf_val = dict_key_by_value(FW_STORAGE_CONF_MAP, storage_conf)
-                    cmd = "{},{:d}".format(cmd, storage_conf_val)
+                    storage_conf_val = FW_STORAGE_CONF_MAP_INV[storage_conf]
+                    cmd = "%s,%d" % (cmd, storage_conf_val)
                     ret["storage_conf"] = storage_conf
 
                 else:
                     # Otherwise, just use the one set currently
-                    cmd = "{},{:d}".format(cmd, int(match.group("storage_conf")))
+                    cmd = "%s,%d" % (cmd, int(match.group("storage_conf")))
 
                 # Since the modem will restart, we give up the connection and give it time to reboot
                 self.execute(cmd, keep_conn=False, cooldown_delay=cooldown_delay)
@@ -954,7 +1092,7 @@ class LE910CXConn(SerialConn):
         match = res_regex.match(res.get("data", ""))
 
         if not match:
-            log.error("Didn't receive expected response from modem: {}".format(res))
+            log.error("Didn't receive expected response from modem: %s", res)
             raise InvalidResponseException("Didn't receive expected response")
 
         ret["status"] = QSS_MAP[int(match.group("status"))]
@@ -1002,7 +1140,7 @@ class LE910CXConn(SerialConn):
         elif type(res.get("data")) == list: # Multiple line res
             res_data = res.get("data", [])
         else: # Invalid response?
-            log.error("Didn't receive expected response from modem: {}".format(res))
+            log.error("Didn't receive expected response from modem: %s", res)
             raise InvalidResponseException("Didn't receive expected response")
 
         # Process response data
@@ -1022,7 +1160,7 @@ class LE910CXConn(SerialConn):
             match = res_regex.match(line)
 
             if not match:
-                log.error("Didn't receive expected response from modem: {}".format(res))
+                log.error("Didn't receive expected response from modem: %s", res)
                 raise InvalidResponseException("Didn't receive expected response")
 
             ret.append({
@@ -1051,8 +1189,8 @@ class LE910CXConn(SerialConn):
             if pdp_entry: # PDP already exists
                 if delete_cid == True: # User wants to unset this CID
                     if log.isEnabledFor(logging.DEBUG):
-                        log.debug("Going to unset cid {}".format(cid))
-                    self.execute("AT+CGDCONT={:d}".format(cid))
+                        log.debug("Going to unset cid %s", cid)
+                    self.execute("AT+CGDCONT=%d" % cid)
                     ret = [pdp_entry for pdp_entry in ret if pdp_entry["cid"] != cid]
 
                 else: # User wants to change the pdp context
@@ -1061,13 +1199,13 @@ class LE910CXConn(SerialConn):
 
                     if pdp_entry["pdp_type"] != pdp_type or pdp_entry["apn"] != apn or force:
                         # Difference in PDP, set it
-                        if type(pdp_type) != str or pdp_type not in CGDCONT_PDP_TYPE_MAP.values():
-                            raise ValueError("'pdp_type' needs to be one of {}".format(CGDCONT_PDP_TYPE_MAP.values()))
+                        if type(pdp_type) != str or pdp_type not in CGDCONT_PDP_TYPE_MAP_INV:
+                            raise ValueError("'pdp_type' needs to be one of {}".format(sorted(CGDCONT_PDP_TYPE_MAP_INV)))
 
-                        pdp_type_val = dict_key_by_value(CGDCONT_PDP_TYPE_MAP, pdp_type)
+                        pdp_type_val = CGDCONT_PDP_TYPE_MAP_INV[pdp_type]
                         if log.isEnabledFor(logging.DEBUG):
-                            log.debug("Going to change a PDP context. CID: {}, new pdp_type: {}, new apn: {}".format(cid, pdp_type_val, apn))
-                        self.execute("AT+CGDCONT={:d},\"{:s}\",\"{:s}\"".format(cid, pdp_type_val, apn))
+                            log.debug("Going to change a PDP context. CID: %s, new pdp_type: %s, new apn: %s", cid, pdp_type_val, apn)
+                        self.execute("AT+CGDCONT=%d,\"%s\",\"%s\"" % (cid, pdp_type_val, apn))
 
                         new_pdp_context = {
                             "cid": cid,
@@ -1085,19 +1223,19 @@ class LE910CXConn(SerialConn):
             else: # PDP doesn't exist
                 if delete_cid == True:
                     if log.isEnabledFor(logging.DEBUG):
-                        log.debug("CID {} already doesn't exist. Noop due to delete_cid == {}".format(cid, delete_cid))
+                        log.debug("CID %s already doesn't exist. Noop due to delete_cid == %s", cid, delete_cid)
                     return ret
 
                 if pdp_type == None or apn == None:
                     raise ValueError("cid {} doesn't exist. Both 'pdp_type' and 'apn' arguments needs to be set when defining a new PDP context".format(cid))
 
-                if type(pdp_type) != str or pdp_type not in CGDCONT_PDP_TYPE_MAP.values():
-                    raise ValueError("'pdp_type' needs to be one of {}".format(CGDCONT_PDP_TYPE_MAP.values()))
+                if type(pdp_type) != str or pdp_type not in CGDCONT_PDP_TYPE_MAP_INV:
+                    raise ValueError("'pdp_type' needs to be one of {}".format(sorted(CGDCONT_PDP_TYPE_MAP_INV)))
 
-                pdp_type_val = dict_key_by_value(CGDCONT_PDP_TYPE_MAP, pdp_type)
+                pdp_type_val = CGDCONT_PDP_TYPE_MAP_INV[pdp_type]
                 if log.isEnabledFor(logging.DEBUG):
-                    log.debug("Going to set new PDP context. CID: {}, new pdp_type: {}, new apn: {}".format(cid, pdp_type_val, apn))
-                self.execute("AT+CGDCONT={:d},\"{}\",\"{}\"".format(cid, pdp_type_val, apn))
+                    log.debug("Going to set new PDP context. CID: %s, new pdp_type: %s, new apn: %s", cid, pdp_type_val, apn)
+                self.execute("AT+CGDCONT=%d,\"%s\",\"%s\"" % (cid, pdp_type_val, apn))
 
                 ret.append({
                     "cid": cid, # already ensured to be an int
@@ -1189,7 +1327,7 @@ class LE910CXConn(SerialConn):
             raise Exception('Could not match generated regex')
         match_dict = match.groupdict()
 
-        log.info("Match Dict: {}".format(match_dict))
+        log.info("Match Dict: %s", match_dict)
 
         # Convert to correct types
 
@@ -147,16 +147,16 @@ class SerialConn(object):
     def read_line(self, timeout=None):
         try:
 
-            # Use temporary timeout if specified
-            if timeout != None:
-                timeout_orig = self._serial.timeout
+            # Use temporary timeout if specified (changing it reconfigures the port, so only do so when needed)
+            timeout_orig = self._serial.timeout
+            if timeout != None and timeout != timeout_orig:
                 self._serial.timeout = timeout
 
             line = self._serial.readline()
         finally:
 
             # Restore original timeout
-            if timeout != None:
+            if self._serial.timeout != timeout_orig:
                 self._serial.timeout = timeout_orig
 
         log.debug("RX: %s", repr(line))
@@ -173,15 +173,20 @@ class SerialConn(object):
         lines = []
         lines.append(line)
 
-        # Read following lines without any timeout
-        while True:
-            line = self.read_line(timeout=0)
+        # Read following lines without any timeout, set once for all lines instead of reconfiguring the port per line
+        timeout_orig = self._serial.timeout
+        self._serial.timeout = 0
+        try:
+            while True:
+                line = self.read_line()
 
-            # Stop reading when no more data
-            if not line:
-                break
+                # Stop reading when no more data
+                if not line:
+                    break
 
-            lines.append(line)
+                lines.append(line)
+        finally:
+            self._serial.timeout = timeout_orig
 
         return lines
 
@@ -8,41 +8,45 @@
 
 SE050_AUTHID_USER_ID = 0x7DA00001
 
-SE050_AUTHID_USER_ID_VALUE = [0xC0, 0x01, 0x02, 0x03, 0x04]
+SE050_AUTHID_USER_ID_VALUE = b"\xC0\x01\x02\x03\x04"
 
 SE050_AUTHID_ECKEY = 0x7DA00003
 
-SSS_AUTH_SE05X_KEY_HOST_ECDSA_KEY = [
-    0x30, 0x81, 0x87, 0x02, 0x01, 0x00, 0x30, 0x13,
-    0x06, 0x07, 0x2A, 0x86, 0x48, 0xCE, 0x3D, 0x02,
-    0x01, 0x06, 0x08, 0x2A, 0x86, 0x48, 0xCE, 0x3D,
-    0x03, 0x01, 0x07, 0x04, 0x6D, 0x30, 0x6B, 0x02,
-    0x01, 0x01, 0x04, 0x20,
-    0x6D, 0x2F, 0x43, 0x2F, 0x8A, 0x2F, 0x45, 0xEC,
-    0xD5, 0x82, 0x84, 0x7E, 0xC0, 0x83, 0xBB, 0xEB,
-    0xC2, 0x3F, 0x1D, 0xF4, 0xF0, 0xDD, 0x2A, 0x6F,
-    0xB8, 0x1A, 0x24, 0xE7, 0xB6, 0xD5, 0x4C, 0x7F,
-    0xA1, 0x44, 0x03, 0x42, 0x00,
-    0x04, 0x3C, 0x9E, 0x47, 0xED, 0xF0, 0x51, 0xA3,
-    0x58, 0x9F, 0x67, 0x30, 0x2D, 0x22, 0x56, 0x7C,
-    0x2E, 0x17, 0x22, 0x9E, 0x88, 0x83, 0x33, 0x8E,
-    0xC3, 0xB7, 0xD5, 0x27, 0xF9, 0xEE, 0x71, 0xD0,
-    0xA8, 0x1A, 0xAE, 0x7F, 0xE2, 0x1C, 0xAA, 0x66,
-    0x77, 0x78, 0x3A, 0xA8, 0x8D, 0xA6, 0xD6, 0xA8,
-    0xAD, 0x5E, 0xC5, 0x3B, 0x10, 0xBC, 0x0B, 0x11,
-    0x09, 0x44, 0x82, 0xF0, 0x4D, 0x24, 0xB5, 0xBE,
-    0xC4,
-]
+SSS_AUTH_SE05X_KEY_HOST_ECDSA_KEY = (
+    b"\x30\x81\x87\x02\x01\x00\x30\x13"
+    b"\x06\x07\x2A\x86\x48\xCE\x3D\x02"
+    b"\x01\x06\x08\x2A\x86\x48\xCE\x3D"
+    b"\x03\x01\x07\x04\x6D\x30\x6B\x02"
+    b"\x01\x01\x04\x20"
+    b"\x6D\x2F\x43\x2F\x8A\x2F\x45\xEC"
+    b"\xD5\x82\x84\x7E\xC0\x83\xBB\xEB"
+    b"\xC2\x3F\x1D\xF4\xF0\xDD\x2A\x6F"
+    b"\xB8\x1A\x24\xE7\xB6\xD5\x4C\x7F"
+    b"\xA1\x44\x03\x42\x00"
+    b"\x04\x3C\x9E\x47\xED\xF0\x51\xA3"
+    b"\x58\x9F\x67\x30\x2D\x22\x56\x7C"
+    b"\x2E\x17\x22\x9E\x88\x83\x33\x8E"
+    b"\xC3\xB7\xD5\x27\xF9\xEE\x71\xD0"
+    b"\xA8\x1A\xAE\x7F\xE2\x1C\xAA\x66"
+    b"\x77\x78\x3A\xA8\x8D\xA6\xD6\xA8"
+    b"\xAD\x5E\xC5\x3B\x10\xBC\x0B\x11"
+    b"\x09\x44\x82\xF0\x4D\x24\xB5\xBE"
+    b"\xC4"
+)
 
 SE050_AUTHID_AESKEY = 0x7DA00002
-SE050_AUTHID_AESKEY_VALUE = [0x40, 0x41, 0x42, 0x43, 0x44, 0x45, 0x46, 0x47,
-                             0x48, 0x49, 0x4a, 0x4b, 0x4c, 0x4d, 0x4e, 0x4f, ]
+SE050_AUTHID_AESKEY_VALUE = (
+    b"\x40\x41\x42\x43\x44\x45\x46\x47"
+    b"\x48\x49\x4A\x4B\x4C\x4D\x4E\x4F"
+)
 
 SE050_AUTHID_PLATFORM_SCP = 0x7FFF0207
-SE050_AUTHID_PLATFORM_SCP_VALUE = [0x70, 0x9e, 0x6c, 0xdb, 0xb7, 0x97, 0x6c, 0x48,
-                                   0xa1, 0x6a, 0x9a, 0x59, 0x38, 0xc2, 0x7c, 0x7b,
-                                   0xc6, 0x7c, 0x7e, 0x98, 0x61, 0x1e, 0x7c, 0x9e,
-                                   0xe7, 0xcb, 0x8a, 0x4b, 0x79, 0x03, 0x9a, 0x91, ]
+SE050_AUTHID_PLATFORM_SCP_VALUE = (
+    b"\x70\x9E\x6C\xDB\xB7\x97\x6C\x48"
+    b"\xA1\x6A\x9A\x59\x38\xC2\x7C\x7B"
+    b"\xC6\x7C\x7E\x98\x61\x1E\x7C\x9E"
+    b"\xE7\xCB\x8A\x4B\x79\x03\x9A\x91"
+)
 
 # This key version is constant for platform scp
 SE05X_KEY_VERSION_NO = 0x0B
@@ -0,0 +1,80 @@
+#
+# Added by AutoPi 2026
+#
+
+"""
+Pool of reusable byte buffers for staging data passed to the SE05x C library.
+"""
+
+import ctypes
+import threading
+
+# Smallest buffer allocated by the pool, larger buffers are rounded up to the next power of two
+MIN_BUFFER_SIZE = 64
+
+# Maximum number of released buffers kept for reuse
+MAX_FREE_BUFFERS = 8
+
+
+class BufferPool:  # pylint: disable=too-few-public-methods
+    """
+    Hands out recycled bytearrays of at least the requested size. Buffers are zeroed when released
+    as they may contain key material.
+    """
+
+    def __init__(self, min_size=MIN_BUFFER_SIZE, max_free=MAX_FREE_BUFFERS):
+        self._min_size = min_size
+        self._max_free = max_free
+        self._free = []
+        self._lock = threading.Lock()
+
+    def acquire(self, size):
+        """
+        Get a buffer from the pool
+        :param size: Minimum size of the buffer
+        :return: bytearray of at least the requested size
+        """
+        with self._lock:
+            for i, buf in enumerate(self._free):
+                if len(buf) >= size:
+                    return self._free.pop(i)
+
+        alloc_size = self._min_size
+        while alloc_size < size:
+            alloc_size <<= 1
+
+        return bytearray(alloc_size)
+
+    def release(self, buf):
+        """
+        Return a buffer to the pool
+        :param buf: Buffer previously returned by acquire
+        :return: None
+        """
+        # Zero in place to avoid allocating a new buffer
+        ctypes.memset((ctypes.c_char * len(buf)).from_buffer(buf), 0, len(buf))
+
+        with self._lock:
+            if len(self._free) < self._max_free:
+                self._free.append(buf)
+
+
+_POOL = BufferPool()
+
+
+def acquire(size):
+    """
+    Get a buffer of at least the requested size from the default pool
+    :param size: Minimum size of the buffer
+    :return: bytearray
+    """
+    return _POOL.acquire(size)
+
+
+def release(buf):
+    """
+    Return a buffer to the default pool
+    :param buf: Buffer previously returned by acquire
+    :return: None
+    """
+    _POOL.release(buf)
@@ -11,6 +11,7 @@ import logging
 import os
 from inspect import currentframe
 from . import authkey
+from . import bufpool
 from . import sss_api as apis
 from . import util
 from .util import status_to_str
@@ -211,13 +212,17 @@ class PrepareHostSession:  # pylint: disable=too-many-instance-attributes
             return status
 
         # Set Host ECDSA Key pair
-        status = apis.sss_key_store_set_key(
-            ctypes.byref(self.host_keystore.keystore),
-            ctypes.byref(static_ctx.HostEcdsaObj),
-            ctypes.byref((ctypes.c_ubyte * len(authkey.SSS_AUTH_SE05X_KEY_HOST_ECDSA_KEY))
-                         (*authkey.SSS_AUTH_SE05X_KEY_HOST_ECDSA_KEY)),
-            len(authkey.SSS_AUTH_SE05X_KEY_HOST_ECDSA_KEY),
-            len(authkey.SSS_AUTH_SE05X_KEY_HOST_ECDSA_KEY) * 8, 0, 0)
+        key_len = len(authkey.SSS_AUTH_SE05X_KEY_HOST_ECDSA_KEY)
+        key_buf = bufpool.acquire(key_len)
+        try:
+            key_buf[:key_len] = authkey.SSS_AUTH_SE05X_KEY_HOST_ECDSA_KEY
+            status = apis.sss_key_store_set_key(
+                ctypes.byref(self.host_keystore.keystore),
+                ctypes.byref(static_ctx.HostEcdsaObj),
+                ctypes.byref((ctypes.c_ubyte * key_len).from_buffer(key_buf)),
+                key_len, key_len * 8, 0, 0)
+        finally:
+            bufpool.release(key_buf)
         if status != apis.kStatus_SSS_Success:
             log.error("sss_key_store_set_key %s", status_to_str(status))
             return status
@@ -297,7 +302,7 @@ class PrepareHostSession:  # pylint: disable=too-many-instance-attributes
         :param key_id: Key Index
         :param key_obj: Key object
         :param cypher_type: Cypher type
-        :param key_value: Key value
+        :param key_value: Key value as bytes or integer list
         :return: None
         """
 
@@ -313,11 +318,18 @@ class PrepareHostSession:  # pylint: disable=too-many-instance-attributes
         if status != apis.kStatus_SSS_Success:
             raise Exception("sss_key_object_allocate_handle %s" % status_to_str(status))
 
-        status = apis.sss_key_store_set_key(
-            ctypes.byref(self.host_keystore.keystore),
-            ctypes.byref(key_obj),
-            ctypes.byref((ctypes.c_ubyte * len(key_value))(*key_value)),
-            len(key_value), len(key_value) * 8, 0, 0)
+        key_len = len(key_value)
+        key_buf = bufpool.acquire(key_len)
+        try:
+            # NOTE: Slice assignment accepts bytes as well as the integer lists read from SCP key files
+            key_buf[:key_len] = key_value
+            status = apis.sss_key_store_set_key(
+                ctypes.byref(self.host_keystore.keystore),
+                ctypes.byref(key_obj),
+                ctypes.byref((ctypes.c_ubyte * key_len).from_buffer(key_buf)),
+                key_len, key_len * 8, 0, 0)
+        finally:
+            bufpool.release(key_buf)
         if status != apis.kStatus_SSS_Success:
             raise Exception("sss_key_store_set_key %s" % status_to_str(status))
 
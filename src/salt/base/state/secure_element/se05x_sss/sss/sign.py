@@ -10,6 +10,7 @@ import os
 import ctypes
 import binascii
 import logging
+from . import bufpool
 from . import sss_api as apis
 from .keystore import KeyStore
 from .keyobject import KeyObject
@@ -257,11 +258,19 @@ class Sign:  # pylint: disable=too-few-public-methods
         digest_bytes = (ctypes.c_ubyte * len(_digest))(*_digest)
         mode = apis.kMode_SSS_Sign
         signature_len = 1024
-        data_buf = (ctypes.c_uint8 * signature_len)(0)
-        signature_len = ctypes.c_size_t(signature_len)
-        ctx = Asymmetric(self._session, self._ctx_key,
-                         apis.kAlgorithm_SSS_SHA256, mode)
-        (signature_ctype, status) = ctx.sign(
-            digest_bytes, len(digest_bytes), data_buf, signature_len)
-        signature = binascii.hexlify(signature_ctype)
+        # Reuse pooled buffers as this is called for every signing request
+        buf = bufpool.acquire(signature_len)
+        try:
+            data_buf = (ctypes.c_uint8 * signature_len).from_buffer(buf)
+            signature_len = ctypes.c_size_t(signature_len)
+            ctx = Asymmetric(self._session, self._ctx_key,
+                             apis.kAlgorithm_SSS_SHA256, mode)
+            (_, status) = ctx.sign(
+                digest_bytes, len(digest_bytes), data_buf, signature_len)
+            if status != apis.kStatus_SSS_Success:
+                return status
+            # Only the first signature_len bytes are written by the secure element
+            signature = binascii.hexlify(bytes(buf[:signature_len.value]))
+        finally:
+            bufpool.release(buf)
         return signature